@@ -0,0 +1,187 @@
+import mmap
+import os
+import re
+
+import numpy as np
+
+# Frequency multipliers and data formats from the Touchstone v1 option line
+FREQ_UNITS = {"HZ": 1.0, "KHZ": 1e3, "MHZ": 1e6, "GHZ": 1e9}
+DATA_FORMATS = ("RI", "MA", "DB")
+
+_OPTION_LINE = re.compile(rb"^[ \t]*#([^\n!]*)", re.MULTILINE)
+_COMMENTS = re.compile(rb"![^\n]*")
+CHUNK_SIZE = 8 * 1024 * 1024  # Bytes of text parsed per NumPy call
+
+
+def touchstone_port_count(name):
+    """Reads the port count from a '.sNp' file name, e.g. 'dipole.s1p' -> 1."""
+    match = re.search(r"\.s(\d+)p$", str(name), re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Cannot infer port count from file name: {name}")
+    return int(match.group(1))
+
+
+def _parse_option_line(tokens):
+    """Parses the '# <unit> S <format> R <z0>' option line (order-independent)."""
+    unit, data_format, z0 = "GHZ", "MA", 50.0
+    tokens = [t.upper() for t in tokens]
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token in FREQ_UNITS:
+            unit = token
+        elif token in DATA_FORMATS:
+            data_format = token
+        elif token == "R" and i + 1 < len(tokens):
+            z0 = float(tokens[i + 1])
+            i += 1
+        elif token != "S":
+            raise ValueError(f"Unsupported Touchstone option: {token}")
+        i += 1
+    return unit, data_format, z0
+
+
+def _to_complex(a, b, data_format):
+    """Converts a pair of value arrays in RI/MA/DB format to complex values."""
+    if data_format == "RI":
+        return a + 1j * b
+    mag = a if data_format == "MA" else 10.0 ** (a / 20.0)
+    return mag * np.exp(1j * np.radians(b))
+
+
+def _parse_values(data, start, chunk_size):
+    """
+    Parses the numeric data of data[start:] in line-aligned chunks, so a memory-mapped file
+    is only ever copied one chunk at a time. Returns a flat float64 array.
+    """
+    chunks = []
+    while start < len(data):
+        end = data.find(b"\n", min(start + chunk_size, len(data)))
+        end = len(data) if end == -1 else end + 1
+        chunk = data[start:end]
+        if b"!" in chunk:
+            chunk = _COMMENTS.sub(b"", chunk)
+        if b"[" in chunk:
+            raise ValueError("Touchstone v2 keyword sections are not supported.")
+        if chunk.strip():  # np.fromstring returns [-1.] for whitespace-only input
+            chunks.append(np.fromstring(chunk, dtype=np.float64, sep=" "))
+        start = end
+    return np.concatenate(chunks) if chunks else np.empty(0)
+
+
+def parse_touchstone(data, n_ports, chunk_size=CHUNK_SIZE):
+    """
+    Parses Touchstone v1 content (bytes or a buffer such as an mmap) with NumPy, chunk by chunk.
+    Returns (freqs_hz, s, z0) where s has shape (n_freqs, n_ports, n_ports).
+    """
+    option = _OPTION_LINE.search(data)
+    if option is None:
+        raise ValueError("Touchstone option line ('# ...') not found.")
+    unit, data_format, z0 = _parse_option_line(option.group(1).decode("ascii").split())
+    values = _parse_values(data, option.end(), chunk_size)
+
+    row_len = 1 + 2 * n_ports * n_ports
+    if n_ports == 2:
+        # Two-port files may append noise parameters (5 columns) after the network data
+        n_rows = values.size // row_len
+        freqs = values[:n_rows * row_len:row_len]
+        decreasing = np.nonzero(np.diff(freqs) <= 0)[0]
+        if decreasing.size:
+            n_rows = decreasing[0] + 1
+        values = values[:n_rows * row_len]
+    if values.size % row_len:
+        raise ValueError(f"Touchstone data size {values.size} does not match {n_ports} port(s).")
+
+    rows = values.reshape(-1, row_len)
+    freqs_hz = rows[:, 0] * FREQ_UNITS[unit]
+    s = _to_complex(rows[:, 1::2], rows[:, 2::2], data_format).reshape(-1, n_ports, n_ports)
+    if n_ports == 2:
+        # Two-port data is stored as S11 S21 S12 S22 (column-major)
+        s = s.transpose(0, 2, 1)
+    return freqs_hz, s, z0
+
+
+def read_touchstone(file_path, n_ports=None, use_mmap=True):
+    """
+    Reads a Touchstone '.sNp' file. With use_mmap the file is memory-mapped and parsed in
+    chunks, so only the parsed arrays (not the file text) are held in memory.
+    Returns (freqs_hz, s, z0).
+    """
+    if n_ports is None:
+        n_ports = touchstone_port_count(file_path)
+    with open(file_path, "rb") as f:
+        if use_mmap and os.fstat(f.fileno()).st_size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return parse_touchstone(mm, n_ports)
+        return parse_touchstone(f.read(), n_ports)
+
+
+def _record_format(n_ports, precision, freq_precision):
+    """Builds the printf format for one frequency record following Touchstone v1 line layout."""
+    value = f"% .{precision}e"
+    freq = f"% .{freq_precision}e"
+    pair = f"{value} {value}"
+    if n_ports <= 2:
+        return " ".join([freq] + [pair] * (n_ports * n_ports))
+    lines = []
+    for row in range(n_ports):
+        chunks = [" ".join([pair] * min(4, n_ports - c)) for c in range(0, n_ports, 4)]
+        if row == 0:
+            chunks[0] = f"{freq} {chunks[0]}"
+        lines.extend(chunks)
+    return "\n".join(lines)
+
+
+def write_touchstone(file_path, freqs_hz, s, z0=50.0, unit="GHz", data_format="MA", precision=9, comment=None,
+                     freq_precision=None):
+    """
+    Writes S-parameters to a Touchstone v1 file (path or text file object).
+    s may have shape (n_freqs,) for a single port or (n_freqs, n_ports, n_ports).
+    precision / freq_precision are the digits after the decimal point for the data and the
+    frequency column (freq_precision defaults to precision).
+    """
+    unit_key, format_key = unit.upper(), data_format.upper()
+    if unit_key not in FREQ_UNITS or format_key not in DATA_FORMATS:
+        raise ValueError(f"Unsupported Touchstone unit/format: {unit}/{data_format}")
+    freqs_hz = np.asarray(freqs_hz, dtype=np.float64)
+    s = np.asarray(s, dtype=np.complex128).reshape(freqs_hz.size, -1)
+    n_ports = int(round(np.sqrt(s.shape[1])))
+    if n_ports * n_ports != s.shape[1]:
+        raise ValueError(f"S-parameter array of shape {s.shape} is not square per frequency.")
+    if n_ports == 2:
+        s = s.reshape(-1, 2, 2).transpose(0, 2, 1).reshape(-1, 4)
+
+    if format_key == "RI":
+        a, b = s.real, s.imag
+    else:
+        mag = np.abs(s)
+        a = mag if format_key == "MA" else 20.0 * np.log10(np.maximum(mag, 1e-300))
+        b = np.degrees(np.angle(s))
+
+    rows = np.empty((freqs_hz.size, 1 + 2 * s.shape[1]))
+    rows[:, 0] = freqs_hz / FREQ_UNITS[unit_key]
+    rows[:, 1::2] = a
+    rows[:, 2::2] = b
+
+    header = f"# {unit} S {format_key} R {z0:g}"
+    if comment:
+        header = "\n".join(f"! {line}" for line in comment.splitlines()) + "\n" + header
+    np.savetxt(file_path, rows, fmt=_record_format(n_ports, precision, precision if freq_precision is None else freq_precision), header=header, comments="")
+    if isinstance(file_path, (str, os.PathLike)):
+        print(f"Touchstone data written to: {file_path}")
+
+
+def resample_s_parameters(freqs_hz, s, target_freqs_hz):
+    """
+    Linearly resamples complex S-parameters onto target frequencies.
+    Points outside the source band are returned as NaN so traces are not extrapolated.
+    """
+    freqs_hz = np.asarray(freqs_hz, dtype=np.float64)
+    s = np.asarray(s, dtype=np.complex128)
+    target_freqs_hz = np.asarray(target_freqs_hz, dtype=np.float64)
+    flat = s.reshape(freqs_hz.size, -1)
+    out = np.empty((target_freqs_hz.size, flat.shape[1]), dtype=np.complex128)
+    for k in range(flat.shape[1]):
+        out[:, k] = (np.interp(target_freqs_hz, freqs_hz, flat[:, k].real, left=np.nan, right=np.nan)
+                     + 1j * np.interp(target_freqs_hz, freqs_hz, flat[:, k].imag, left=np.nan, right=np.nan))
+    return out.reshape((target_freqs_hz.size,) + s.shape[1:])
@@ -6,3 +6,6 @@ DEFAULT_FREQ_GHZ = 1.0
 SOLUTION_TYPE = "Terminal"  # Hardcoded as per request
 MACHINE_ADDRESS = None
 GRPC_PORT = None
+DEFAULT_HISTORY_MAX_RUNS = 10  # Runs kept in the in-session result history
+DEFAULT_HISTORY_BUDGET_MB = 50  # Memory budget for stored result arrays
+TIMING_HISTORY_FILE = "solver_timings.json"  # Past run timings used to auto-tune solver resources
@@ -32,12 +32,24 @@ def setup_frequency_sweep(hfss, setup_name, freq_ghz, sweep_name="DefaultSweep",
         raise
 
 
-def run_analysis(hfss, setup_name):
-    """Runs the HFSS analysis for the specified setup."""
+def run_analysis(hfss, setup_name, cores=None, tasks=None):
+    """
+    Runs the HFSS analysis for the specified setup, optionally with explicit cores/tasks.
+    Returns the result of analyze_setup (False if the solve failed).
+    """
     print(f"Starting analysis for setup '{setup_name}'...")
+    resources = {}
+    if cores is not None:
+        resources["cores"] = cores
+    if tasks is not None:
+        resources["tasks"] = tasks
     try:
-        hfss.analyze_setup(setup_name)
-        print("Analysis completed.")
+        success = hfss.analyze_setup(setup_name, **resources)
+        if success is False:
+            print(f"Analysis of setup '{setup_name}' failed.")
+        else:
+            print("Analysis completed.")
+        return success
     except Exception as e:
         print(f"Error during analysis: {e}")
         raise
@@ -0,0 +1,274 @@
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+from hfss_simulation.analysis import run_analysis
+
+try:
+    import psutil  # Installed with pyaedt
+except ImportError:
+    psutil = None
+
+# Scaling model used until enough timings are recorded:
+#   wall_time = seconds_per_unit * mesh_size ** size_exponent * (serial_fraction + (1 - serial_fraction) / cores)
+DEFAULT_SECONDS_PER_UNIT = 2e-3
+DEFAULT_SIZE_EXPONENT = 1.1
+DEFAULT_SERIAL_FRACTION = 0.15
+# Rough solver memory model: base + per-element cost (GB)
+BASE_MEMORY_GB = 1.0
+MEMORY_GB_PER_ELEMENT = 8e-6
+CORES_PER_TASK = 4  # Cores given to each distributed task
+MIN_CORE_SAVING_S = 10.0  # Predicted wall-clock saving an extra core must bring to a job
+
+
+def machine_load():
+    """
+    Returns a snapshot of the machine: logical cores, busy cores (from the 1-min load average)
+    and available memory in GB (None if it cannot be determined).
+    """
+    total_cores = os.cpu_count() or 1
+    try:
+        busy_cores = min(float(total_cores), os.getloadavg()[0])
+    except (AttributeError, OSError):  # Not available on Windows
+        busy_cores = psutil.cpu_percent(interval=0.1) / 100 * total_cores if psutil else 0.0
+    available_memory_gb = psutil.virtual_memory().available / 1024 ** 3 if psutil else None
+    return {"total_cores": total_cores, "busy_cores": busy_cores, "available_memory_gb": available_memory_gb}
+
+
+def estimate_mesh_size(params, max_passes=10):
+    """
+    Heuristic mesh size (tetrahedra) for a dipole design, used when no solved mesh is known.
+    Scales with the radiation box volume in cubic wavelengths and the adaptive pass budget.
+    """
+    box_mm = 2 * (params["arm_length"] + params["gap"] / 2 + params["offset"])
+    volume_wavelengths = (box_mm / params["lambda_mm"]) ** 3
+    return int(5000 * max(volume_wavelengths, 0.1) * 1.25 ** min(max_passes, 10))
+
+
+def estimate_memory_gb(mesh_size):
+    """Estimated peak solver memory for a job of the given mesh size."""
+    return BASE_MEMORY_GB + MEMORY_GB_PER_ELEMENT * mesh_size
+
+
+def _is_valid_record(record):
+    """True for a timing record with a positive, finite mesh size, core count and wall time."""
+    try:
+        values = [float(record["mesh_size"]), float(record["cores"]), float(record["wall_time_s"])]
+    except (KeyError, TypeError, ValueError):
+        return False
+    return all(math.isfinite(v) and v > 0 for v in values)
+
+
+class TimingHistory:
+    """
+    Past run timings (mesh size, cores, wall-clock seconds), optionally persisted to a JSON file.
+    Several sessions may share the file: record() reloads it before appending, so timings saved
+    by other sessions are kept (a write landing between the reload and the save can still be lost).
+    """
+
+    def __init__(self, file_path=None, max_records=500):
+        self.file_path = file_path
+        self.max_records = max_records
+        self.records = self._load() or []
+
+    def _load(self):
+        """Valid records from the history file, or None if there is no readable file."""
+        if not (self.file_path and os.path.exists(self.file_path)):
+            return None
+        try:
+            with open(self.file_path) as f:
+                return [r for r in json.load(f) if _is_valid_record(r)][-self.max_records:]
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read timing history '{self.file_path}': {e}")
+            return None
+
+    def record(self, mesh_size, cores, wall_time_s, tasks=1):
+        """Adds one timing and saves the history; invalid timings (e.g. 0 s) are ignored."""
+        record = {"mesh_size": float(mesh_size), "cores": int(cores),
+                  "tasks": int(tasks), "wall_time_s": float(wall_time_s)}
+        if not _is_valid_record(record):
+            print(f"Warning: Ignoring invalid timing record: {record}")
+            return
+        # Merge with timings other sessions saved since this history was loaded
+        saved = self._load()
+        if saved is not None:
+            self.records = saved
+        self.records.append(record)
+        self.records = self.records[-self.max_records:]
+        if self.file_path:
+            try:
+                tmp_path = f"{self.file_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(self.records, f)
+                os.replace(tmp_path, self.file_path)
+            except OSError as e:
+                print(f"Warning: Could not save timing history '{self.file_path}': {e}")
+
+    def fit(self):
+        """
+        Fits the scaling model to the recorded timings. Returns a dict with seconds_per_unit,
+        size_exponent and serial_fraction; defaults are used for anything the data cannot determine.
+        """
+        model = {"seconds_per_unit": DEFAULT_SECONDS_PER_UNIT,
+                 "size_exponent": DEFAULT_SIZE_EXPONENT,
+                 "serial_fraction": DEFAULT_SERIAL_FRACTION}
+        records = [r for r in self.records if _is_valid_record(r)]
+        if not records:
+            return model
+        n = np.array([r["mesh_size"] for r in records], dtype=np.float64)
+        c = np.array([r["cores"] for r in records], dtype=np.float64)
+        t = np.array([r["wall_time_s"] for r in records], dtype=np.float64)
+        fit_exponent = len(records) >= 3 and np.ptp(np.log(n)) > 0.1
+        fit_serial = len(records) >= 3 and np.ptp(c) > 0
+
+        best = None
+        for f in (np.linspace(0.01, 0.99, 99) if fit_serial else [model["serial_fraction"]]):
+            y = np.log(t / (f + (1 - f) / c))
+            if fit_exponent:
+                b, log_a = np.polyfit(np.log(n), y, 1)
+            else:
+                b = model["size_exponent"]
+                log_a = np.mean(y - b * np.log(n))
+            residual = np.sum((y - log_a - b * np.log(n)) ** 2)
+            if best is None or residual < best[0]:
+                best = (residual, f, b, log_a)
+        _, f, b, log_a = best
+        return {"seconds_per_unit": float(np.exp(log_a)), "size_exponent": float(b), "serial_fraction": float(f)}
+
+
+def predict_wall_time(model, mesh_size, cores):
+    """Predicted wall-clock seconds of one job under the fitted scaling model."""
+    f = model["serial_fraction"]
+    return model["seconds_per_unit"] * mesh_size ** model["size_exponent"] * (f + (1 - f) / cores)
+
+
+def _choose_cores(model, mesh_size, max_cores, min_efficiency, min_saving_s):
+    """
+    Largest core count (up to max_cores) where each extra core still keeps parallel efficiency
+    above min_efficiency and shortens the predicted wall time of this job by min_saving_s.
+    Small jobs therefore stop at fewer cores than large ones.
+    """
+    f = model["serial_fraction"]
+    cores = 1
+    for c in range(2, max_cores + 1):
+        saving = predict_wall_time(model, mesh_size, c - 1) - predict_wall_time(model, mesh_size, c)
+        if 1 / (f + (1 - f) / c) / c < min_efficiency or saving < min_saving_s:
+            break
+        cores = c
+    return cores
+
+
+def choose_job_resources(mesh_size, history=None, load=None, min_efficiency=0.5, min_saving_s=MIN_CORE_SAVING_S,
+                         distributed=False):
+    """
+    Picks cores, tasks and a memory estimate for one analysis from the current machine load and
+    the timing history. A core is only added while it keeps parallel efficiency above
+    min_efficiency and saves at least min_saving_s of predicted wall time for this mesh size;
+    the remaining cores are left to other jobs. distributed enables multiple tasks (e.g. discrete
+    sweeps). fits_in_memory is False when the estimated memory exceeds the available memory.
+    """
+    load = load or machine_load()
+    model = history.fit() if history else TimingHistory().fit()
+    free_cores = max(1, int(load["total_cores"] - math.ceil(load["busy_cores"])))
+    cores = _choose_cores(model, mesh_size, free_cores, min_efficiency, min_saving_s)
+    tasks = max(1, cores // CORES_PER_TASK) if distributed else 1
+    memory_gb = estimate_memory_gb(mesh_size)
+    available_memory_gb = load.get("available_memory_gb")
+    fits_in_memory = available_memory_gb is None or memory_gb <= available_memory_gb
+    return {"cores": cores, "tasks": tasks, "memory_gb": round(memory_gb, 2), "fits_in_memory": fits_in_memory,
+            "predicted_time_s": predict_wall_time(model, mesh_size, cores)}
+
+
+def plan_batch(mesh_sizes, history=None, load=None, distributed=False):
+    """
+    Decides how to run a batch of jobs: several small jobs concurrently or one job at a time
+    with many cores. Each concurrency level splits the free cores evenly, jobs are assigned
+    longest-first to the earliest free slot, and the level with the shortest predicted makespan
+    that fits in available memory wins.
+    Returns a dict with concurrency, cores/tasks/memory per job, predicted makespan and job order.
+    """
+    load = load or machine_load()
+    model = history.fit() if history else TimingHistory().fit()
+    free_cores = max(1, int(load["total_cores"] - math.ceil(load["busy_cores"])))
+    order = sorted(range(len(mesh_sizes)), key=lambda i: mesh_sizes[i], reverse=True)
+    peak_memory_gb = max((estimate_memory_gb(n) for n in mesh_sizes), default=0.0)
+
+    best = None
+    for concurrency in range(1, min(free_cores, len(mesh_sizes)) + 1):
+        available_memory_gb = load.get("available_memory_gb")
+        if concurrency > 1 and available_memory_gb is not None and concurrency * peak_memory_gb > available_memory_gb:
+            break
+        cores = free_cores // concurrency
+        slots = [0.0] * concurrency
+        for i in order:
+            slot = slots.index(min(slots))
+            slots[slot] += predict_wall_time(model, mesh_sizes[i], cores)
+        makespan = max(slots)
+        if best is None or makespan < best["makespan_s"]:
+            best = {"concurrency": concurrency, "cores": cores,
+                    "tasks": max(1, cores // CORES_PER_TASK) if distributed else 1,
+                    "memory_gb": round(peak_memory_gb, 2), "makespan_s": makespan, "order": order}
+    return best
+
+
+def run_tuned_analysis(hfss, setup_name, mesh_size, history=None, load=None, distributed=False, clock=time.perf_counter,
+                       resources=None):
+    """
+    Runs the analysis with auto-tuned cores/tasks and records the wall-clock time in history.
+    resources can be precomputed with choose_job_resources (e.g. to warn the user first).
+    Jobs whose memory estimate exceeds the available memory are not solved (skipped=True).
+    clock can be replaced (e.g. by SimulatedBackend.clock) so simulated runs report model time.
+    Only successful solves are recorded. Returns the resources used, including success and
+    the measured wall_time_s.
+    """
+    if resources is None:
+        resources = choose_job_resources(mesh_size, history=history, load=load, distributed=distributed)
+    resources = dict(resources, skipped=False)
+    print(f"Resources for '{setup_name}': {resources['cores']} cores, {resources['tasks']} task(s), "
+          f"~{resources['memory_gb']} GB (predicted {resources['predicted_time_s']:.0f} s).")
+    if not resources["fits_in_memory"]:
+        print(f"Skipping '{setup_name}': estimated {resources['memory_gb']} GB exceeds the available memory.")
+        resources.update(success=False, skipped=True, wall_time_s=0.0)
+        return resources
+    start = clock()
+    resources["success"] = run_analysis(hfss, setup_name, cores=resources["cores"], tasks=resources["tasks"]) is not False
+    resources["wall_time_s"] = clock() - start
+    if history is not None and resources["success"] and resources["wall_time_s"] > 0:
+        history.record(mesh_size, resources["cores"], resources["wall_time_s"], tasks=resources["tasks"])
+    return resources
+
+
+class SimulatedBackend:
+    """
+    Stand-in for an Hfss object that models solver scaling instead of solving.
+    analyze_setup advances a virtual clock by the modelled wall time, so resource
+    choices can be exercised without AEDT. With fail=True every solve returns False
+    immediately, like a failed analyze_setup.
+    """
+
+    def __init__(self, mesh_size, seconds_per_unit=DEFAULT_SECONDS_PER_UNIT, size_exponent=DEFAULT_SIZE_EXPONENT,
+                 serial_fraction=DEFAULT_SERIAL_FRACTION, noise=0.0, seed=None, fail=False):
+        self.mesh_size = mesh_size
+        self.model = {"seconds_per_unit": seconds_per_unit, "size_exponent": size_exponent,
+                      "serial_fraction": serial_fraction}
+        self.noise = noise
+        self.fail = fail
+        self.rng = np.random.default_rng(seed)
+        self.elapsed_s = 0.0
+        self.calls = []
+
+    def clock(self):
+        return self.elapsed_s
+
+    def analyze_setup(self, name, cores=1, tasks=1, **kwargs):
+        self.calls.append({"name": name, "cores": cores, "tasks": tasks})
+        if self.fail:
+            return False
+        wall_time = predict_wall_time(self.model, self.mesh_size, cores)
+        if self.noise:
+            wall_time *= 1 + self.noise * self.rng.standard_normal()
+        self.elapsed_s += max(wall_time, 0.0)
+        return True
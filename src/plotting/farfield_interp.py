@@ -0,0 +1,122 @@
+import numpy as np
+
+
+def _uniform_step(angles, name):
+    """Returns the step of a uniformly spaced angle vector, or raises ValueError."""
+    steps = np.diff(angles)
+    if angles.size < 2 or not np.allclose(steps, steps[0], atol=1e-6) or steps[0] <= 0:
+        raise ValueError(f"{name} samples must be uniformly spaced and increasing.")
+    return steps[0]
+
+
+def _fourier_basis(x, n):
+    """
+    Trigonometric interpolation basis for n periodic samples evaluated at x (radians).
+    The Nyquist term of an even-length series uses cos() so real data stays real.
+    """
+    k = np.fft.fftfreq(n, d=1.0 / n)
+    basis = np.exp(1j * np.outer(x, k))
+    if n % 2 == 0:
+        basis[:, n // 2] = np.cos(n // 2 * x)
+    return basis
+
+
+class FarFieldModel:
+    """
+    Far-field pattern on the whole sphere reconstructed from a coarse, uniform Theta/Phi grid.
+
+    The grid is extended to a doubly periodic function (double Fourier sphere): theta is
+    continued past the poles with f(-theta, phi) = f(theta, phi + 180deg), which keeps the
+    pole and the phi wraparound consistent. The 2D Fourier coefficients of that extension are
+    kept, so any resolution or cut is evaluated locally by trigonometric interpolation.
+    """
+
+    def __init__(self, coefficients, non_negative=True):
+        self.coefficients = coefficients
+        self.non_negative = non_negative
+
+    @classmethod
+    def from_grid(cls, theta_deg, phi_deg, values):
+        """
+        Fits the model to values shaped (theta, phi). Theta must span 0..180 deg and phi one
+        full turn, both uniformly sampled; a duplicated phi endpoint (e.g. -180 and 180) is dropped.
+        """
+        theta_deg = np.asarray(theta_deg, dtype=np.float64)
+        phi_deg = np.asarray(phi_deg, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape != (theta_deg.size, phi_deg.size):
+            raise ValueError(f"Values shape {values.shape} does not match ({theta_deg.size}, {phi_deg.size}).")
+
+        _uniform_step(theta_deg, "Theta")
+        if not (np.isclose(theta_deg[0], 0) and np.isclose(theta_deg[-1], 180)):
+            raise ValueError("Theta samples must include both poles (0 and 180 deg).")
+        if np.isclose(phi_deg[-1] - phi_deg[0], 360):
+            phi_deg, values = phi_deg[:-1], values[:, :-1]
+        phi_step = _uniform_step(phi_deg, "Phi")
+        n_phi = phi_deg.size
+        if not np.isclose(n_phi * phi_step, 360) or n_phi % 2:
+            raise ValueError("Phi samples must cover one full turn with an even number of points.")
+        if not np.isclose(phi_deg[0] / phi_step, round(phi_deg[0] / phi_step)):
+            raise ValueError("Phi samples must be aligned with 0 deg.")
+
+        # Start phi at 0 so the FFT phase reference matches the evaluation angles
+        values = np.roll(values, -int(round((0 - phi_deg[0]) / phi_step)) % n_phi, axis=1)
+        # Continue theta over the poles: rows 180 < theta < 360 are theta' = 360 - theta at phi + 180
+        mirrored = np.roll(values[-2:0:-1], n_phi // 2, axis=1)
+        extended = np.concatenate([values, mirrored], axis=0)
+        coefficients = np.fft.fft2(extended) / extended.size
+        return cls(coefficients, non_negative=bool(np.all(values >= 0)))
+
+    def evaluate(self, theta_deg, phi_deg):
+        """Evaluates the pattern on the outer grid theta x phi (degrees); returns shape (theta, phi)."""
+        theta = np.radians(np.atleast_1d(np.asarray(theta_deg, dtype=np.float64)))
+        phi = np.radians(np.atleast_1d(np.asarray(phi_deg, dtype=np.float64)))
+        n_theta, n_phi = self.coefficients.shape
+        result = (_fourier_basis(theta, n_theta) @ self.coefficients @ _fourier_basis(phi, n_phi).T).real
+        if self.non_negative:
+            np.maximum(result, 0.0, out=result)
+        return result
+
+    def grid(self, theta_step_deg=1.0, phi_step_deg=1.0):
+        """Returns (theta_deg, phi_deg, values) on a regular grid with the given steps."""
+        theta = np.linspace(0.0, 180.0, int(round(180.0 / theta_step_deg)) + 1)
+        phi = np.linspace(-180.0, 180.0, int(round(360.0 / phi_step_deg)) + 1)
+        return theta, phi, self.evaluate(theta, phi)
+
+    def phi_cut(self, phi_deg, n_points=361):
+        """
+        Full great-circle cut through the poles in the plane phi (e.g. E-plane of a z-dipole).
+        Returns (angle_deg, values) with angle -180..180, where negative angles lie at phi + 180.
+        """
+        angle = np.linspace(-180.0, 180.0, n_points)
+        values = np.where(angle >= 0,
+                          self.evaluate(np.abs(angle), [phi_deg])[:, 0],
+                          self.evaluate(np.abs(angle), [phi_deg + 180.0])[:, 0])
+        return angle, values
+
+    def theta_cut(self, theta_deg=90.0, n_points=361):
+        """Conical cut at constant theta (theta = 90 is the H-plane of a z-dipole). Returns (phi_deg, values)."""
+        phi = np.linspace(-180.0, 180.0, n_points)
+        return phi, self.evaluate([theta_deg], phi)[0]
+
+
+def interpolation_error(model, theta_deg, phi_deg, reference):
+    """
+    Compares the model against a fine reference grid shaped (theta, phi).
+    Returns max/RMS absolute error and the max error relative to the reference peak.
+    """
+    reference = np.asarray(reference, dtype=np.float64)
+    error = model.evaluate(theta_deg, phi_deg) - reference
+    peak = np.max(np.abs(reference)) or 1.0
+    return {"max_abs": float(np.max(np.abs(error))),
+            "rms": float(np.sqrt(np.mean(error ** 2))),
+            "max_rel_peak": float(np.max(np.abs(error)) / peak)}
+
+
+def coarse_angles(step_deg):
+    """Theta (0..180) and Phi (-180..180) sample angles in degrees for a coarse far-field request."""
+    if 180 % step_deg:
+        raise ValueError(f"Angle step {step_deg} deg must divide 180.")
+    theta = np.arange(0, 180 + step_deg, step_deg)
+    phi = np.arange(-180, 180 + step_deg, step_deg)
+    return theta, phi
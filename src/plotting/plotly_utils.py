@@ -1,6 +1,8 @@
 import re
 import numpy as np
 import plotly.graph_objs as go
+from aedt_utils.touchstone import resample_s_parameters
+from plotting.farfield_interp import coarse_angles
 
 # Helper function to parse angle strings like "-180deg" -> -180.0
 def _parse_angle(angle_str):
@@ -10,8 +12,8 @@ def _parse_angle(angle_str):
     else:
         raise ValueError(f"Could not parse angle: {angle_str}")
     
-def interactive_s11(hfss, setup_name, sweep_name):
-    """Generate an interactive line plot of S11 vs frequency using Plotly."""
+def get_s11_data(hfss, setup_name, sweep_name):
+    """Returns (freqs_hz, s11) as NumPy arrays for the given sweep, or None if no data."""
     setup_sweep = f"{setup_name} : {sweep_name}"
     solution_data = hfss.post.get_solution_data(
         expressions="S(1,1)",
@@ -20,14 +22,34 @@ def interactive_s11(hfss, setup_name, sweep_name):
     )
     if not solution_data or not solution_data.primary_sweep_values:
         return None
-    freqs = solution_data.primary_sweep_values
-    s11 = solution_data.data_db20()
+    freqs = np.asarray(solution_data.primary_sweep_values, dtype=np.float64)
+    s11 = np.asarray(solution_data.data_real(), dtype=np.float64) + 1j * np.asarray(solution_data.data_imag(), dtype=np.float64)
+    return freqs, s11
+
+def s11_figure(freqs, s11, measured=None):
+    """
+    Build the S11 figure from arrays. measured is an optional (freqs_hz, s) tuple, e.g. from
+    read_touchstone; it is resampled onto the simulated frequency grid before overlaying.
+    """
+    freqs = np.asarray(freqs, dtype=np.float64)
+    s11_db = 20 * np.log10(np.maximum(np.abs(s11), 1e-15))
     fig = go.Figure(data=go.Scatter(
-        x=[f/1e9 for f in freqs],
-        y=s11,
+        x=freqs / 1e9,
+        y=s11_db,
         mode='lines',
         name='S11'
     ))
+    if measured is not None:
+        meas_freqs, meas_s = measured
+        meas_s11 = np.asarray(meas_s).reshape(len(meas_freqs), -1)[:, 0]
+        meas_on_grid = resample_s_parameters(meas_freqs, meas_s11, freqs)
+        fig.add_trace(go.Scatter(
+            x=freqs / 1e9,
+            y=20 * np.log10(np.maximum(np.abs(meas_on_grid), 1e-15)),
+            mode='lines',
+            line=dict(dash='dash'),
+            name='S11 (measured)'
+        ))
     fig.update_layout(
         title='Dipole S11',
         xaxis_title='Frequency (GHz)',
@@ -36,11 +58,19 @@ def interactive_s11(hfss, setup_name, sweep_name):
     )
     return fig
 
-def interactive_3d_pattern(hfss, freq_ghz, setup_name):
-    """Generate an interactive 3D radiation pattern using Plotly."""
+def get_3d_pattern_data(hfss, freq_ghz, setup_name, angle_step_deg=None):
+    """
+    Returns (theta_deg, phi_deg, gain) as NumPy arrays with gain shaped (theta, phi), or None if no data.
+    With angle_step_deg only a coarse Theta/Phi grid is requested (see FarFieldModel for resampling).
+    """
     variations = hfss.available_variations.nominal_values
-    variations["Theta"] = ["All"]
-    variations["Phi"] = ["All"]
+    if angle_step_deg:
+        theta_values, phi_values = coarse_angles(angle_step_deg)
+        variations["Theta"] = [f"{a:g}deg" for a in theta_values]
+        variations["Phi"] = [f"{a:g}deg" for a in phi_values]
+    else:
+        variations["Theta"] = ["All"]
+        variations["Phi"] = ["All"]
     variations["Freq"] = [f"{freq_ghz}GHz"]
 
     solution_data = hfss.post.get_solution_data(
@@ -56,11 +86,8 @@ def interactive_3d_pattern(hfss, freq_ghz, setup_name):
 
     phi = np.array([_parse_angle(s) for s in solution_data.intrinsics.get('Phi', [])])
     theta = np.array([_parse_angle(s) for s in solution_data.intrinsics.get('Theta', [])])
-    phi_rad = np.radians(phi)
-    theta_rad = np.radians(theta)
-    THETA, PHI = np.meshgrid(theta_rad, phi_rad, indexing='ij')
 
-    GAIN = np.full(THETA.shape, np.nan)
+    GAIN = np.full((theta.size, phi.size), np.nan)
     gain_data_dict = getattr(solution_data, '_solutions_mag', {}).get('GainTotal', {})
     for key, val in gain_data_dict.items():
         if isinstance(key, tuple) and len(key) == 3:
@@ -73,8 +100,13 @@ def interactive_3d_pattern(hfss, freq_ghz, setup_name):
     if np.isnan(GAIN).all():
         return None
     GAIN = np.nan_to_num(GAIN, nan=np.nanmin(GAIN))
+    return theta, phi, GAIN
+
+def pattern_3d_figure(theta, phi, gain, freq_ghz):
+    """Build the 3D radiation pattern figure from theta/phi (degrees) and gain (theta, phi) arrays."""
+    THETA, PHI = np.meshgrid(np.radians(theta), np.radians(phi), indexing='ij')
 
-    R = GAIN
+    R = gain
     X = R * np.sin(THETA) * np.cos(PHI)
     Y = R * np.sin(THETA) * np.sin(PHI)
     Z = R * np.cos(THETA)
@@ -94,3 +126,19 @@ def interactive_3d_pattern(hfss, freq_ghz, setup_name):
         template='plotly_dark' # Use dark theme
     )
     return fig
+
+def pattern_cut_figure(angle_deg, values, title, xaxis_title):
+    """Build a 2D pattern cut (e.g. E-plane or H-plane) from interpolated far-field values."""
+    fig = go.Figure(data=go.Scatter(
+        x=angle_deg,
+        y=values,
+        mode='lines',
+        name='GainTotal'
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis_title=xaxis_title,
+        yaxis_title='GainTotal',
+        template='plotly_white'
+    )
+    return fig
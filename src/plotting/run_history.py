@@ -0,0 +1,158 @@
+import io
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from aedt_utils.touchstone import write_touchstone
+from plotting.farfield_interp import FarFieldModel
+
+
+class RunHistory:
+    """
+    Bounded in-session store of simulation results.
+
+    Each run keeps only compact arrays: float64 frequencies (so exports keep the solved sweep
+    points) and float32 S11 real/imag, far-field gain and, once fitted, far-field interpolation
+    coefficients; figures are rebuilt from them on demand. Runs are evicted least-recently-used
+    first (adding or viewing a run marks it as used) once either max_runs or the memory budget
+    (in bytes) is exceeded. The most recently used run is always kept, even if it alone exceeds
+    the budget.
+    """
+
+    def __init__(self, max_runs=10, budget_bytes=50 * 1024 * 1024):
+        self.max_runs = max_runs
+        self.budget_bytes = budget_bytes
+        self._runs = OrderedDict()
+        self._next_id = 1
+
+    def __len__(self):
+        return len(self._runs)
+
+    def __contains__(self, run_id):
+        return run_id in self._runs
+
+    @property
+    def nbytes(self):
+        """Total size of the stored result arrays in bytes."""
+        return sum(run["nbytes"] for run in self._runs.values())
+
+    def configure(self, max_runs=None, budget_bytes=None):
+        """Updates the limits (e.g. from sidebar inputs) and evicts runs that no longer fit."""
+        if max_runs is not None:
+            self.max_runs = max_runs
+        if budget_bytes is not None:
+            self.budget_bytes = budget_bytes
+        self._evict()
+
+    def add(self, label, freq_ghz, s11_data=None, pattern_data=None, params=None):
+        """
+        Stores one run and returns its id.
+        s11_data is (freqs_hz, s11) and pattern_data is (theta_deg, phi_deg, gain), as returned by
+        get_s11_data / get_3d_pattern_data; either may be None if the query produced nothing.
+        """
+        arrays = {}
+        if s11_data is not None:
+            freqs, s11 = s11_data
+            s11 = np.asarray(s11)
+            arrays["freqs"] = np.asarray(freqs, dtype=np.float64)
+            arrays["s11_re"] = np.ascontiguousarray(s11.real, dtype=np.float32)
+            arrays["s11_im"] = np.ascontiguousarray(s11.imag, dtype=np.float32)
+        if pattern_data is not None:
+            theta, phi, gain = pattern_data
+            arrays["theta"] = np.asarray(theta, dtype=np.float32)
+            arrays["phi"] = np.asarray(phi, dtype=np.float32)
+            arrays["gain"] = np.asarray(gain, dtype=np.float32)
+
+        run_id = self._next_id
+        self._next_id += 1
+        self._runs[run_id] = {
+            "id": run_id,
+            "label": label,
+            "freq_ghz": freq_ghz,
+            "params": dict(params or {}),
+            "timestamp": time.time(),
+            "arrays": arrays,
+            "nbytes": sum(a.nbytes for a in arrays.values()),
+        }
+        self._evict()
+        return run_id
+
+    def get(self, run_id):
+        """Returns the stored run and marks it as most recently used, or None if it was evicted."""
+        run = self._runs.get(run_id)
+        if run is not None:
+            self._runs.move_to_end(run_id)
+        return run
+
+    def peek(self, run_id):
+        """Returns the stored run without touching its LRU position."""
+        return self._runs.get(run_id)
+
+    def run_ids(self):
+        """Run ids ordered by creation, oldest first."""
+        return sorted(self._runs)
+
+    def touchstone_text(self, run):
+        """
+        Returns the simulated S11 of a run as Touchstone '.s1p' text, or None if it has no S11 data.
+        The text is built once and cached on the run (counted against the memory budget).
+        """
+        if "touchstone_text" not in run:
+            s11_data = s11_from_run(run)
+            if s11_data is None:
+                return None
+            buffer = io.StringIO()
+            # S11 is stored as float32 (~7 significant digits); frequencies keep float64 precision (15 digits)
+            write_touchstone(buffer, *s11_data, comment=f"Simulated S11 - {run['label']}",
+                             precision=6, freq_precision=14)
+            run["touchstone_text"] = buffer.getvalue()
+            self._update_size(run)
+        return run["touchstone_text"]
+
+    def farfield_model(self, run):
+        """
+        Returns the FarFieldModel of a run, or None if it has no far-field data.
+        The fitted coefficients are cached in the run's arrays (counted against the memory budget)
+        so later cuts and resolutions skip the fit.
+        Raises ValueError if the stored grid cannot be fitted (e.g. non-uniform angles).
+        """
+        arrays = run["arrays"]
+        if "ff_coef_re" not in arrays:
+            pattern_data = pattern_from_run(run)
+            if pattern_data is None:
+                return None
+            model = FarFieldModel.from_grid(*pattern_data)
+            arrays["ff_coef_re"] = np.ascontiguousarray(model.coefficients.real, dtype=np.float32)
+            arrays["ff_coef_im"] = np.ascontiguousarray(model.coefficients.imag, dtype=np.float32)
+            arrays["ff_non_negative"] = np.array(model.non_negative)
+            self._update_size(run)
+        coefficients = arrays["ff_coef_re"].astype(np.float64) + 1j * arrays["ff_coef_im"]
+        return FarFieldModel(coefficients, non_negative=bool(arrays["ff_non_negative"]))
+
+    def _update_size(self, run):
+        """Recomputes the size of a run after caching derived data and enforces the limits."""
+        run["nbytes"] = sum(a.nbytes for a in run["arrays"].values()) + len(run.get("touchstone_text", ""))
+        self._evict()
+
+    def _evict(self):
+        while len(self._runs) > 1 and (len(self._runs) > self.max_runs or self.nbytes > self.budget_bytes):
+            run_id, run = self._runs.popitem(last=False)
+            print(f"Run history: evicted run {run_id} ({run['label']}).")
+
+
+def s11_from_run(run):
+    """Returns (freqs_hz, s11) for a stored run, or None if it has no S11 data."""
+    arrays = run["arrays"]
+    if "freqs" not in arrays:
+        return None
+    return arrays["freqs"], arrays["s11_re"] + 1j * arrays["s11_im"]
+
+
+def pattern_from_run(run):
+    """Returns (theta_deg, phi_deg, gain) for a stored run, or None if it has no far-field data."""
+    arrays = run["arrays"]
+    if "gain" not in arrays:
+        return None
+    return arrays["theta"], arrays["phi"], arrays["gain"]
+
@@ -3,7 +3,7 @@ import os
 import sys
 import time # For potential delays if needed, or just structure
 import numpy as np # For default calculation
-from constants import DEFAULT_AEDT_VERSION, DEFAULT_PROJECT_NAME, DEFAULT_DESIGN_NAME, DEFAULT_FREQ_GHZ, SOLUTION_TYPE, MACHINE_ADDRESS, GRPC_PORT
+from constants import DEFAULT_AEDT_VERSION, DEFAULT_PROJECT_NAME, DEFAULT_DESIGN_NAME, DEFAULT_FREQ_GHZ, SOLUTION_TYPE, MACHINE_ADDRESS, GRPC_PORT, DEFAULT_HISTORY_MAX_RUNS, DEFAULT_HISTORY_BUDGET_MB, TIMING_HISTORY_FILE
 
 # --- Page Configuration (Set Layout to Wide) ---
 st.set_page_config(layout="wide")
@@ -19,8 +19,13 @@ from hfss_simulation.geometry import define_parameters, create_dipole_geometry
 from hfss_simulation.boundaries import create_radiation_boundary
 from hfss_simulation.excitations import create_lumped_port
 from hfss_simulation.analysis import setup_analysis, setup_frequency_sweep, run_analysis
-from plotting.plotly_utils import interactive_s11, interactive_3d_pattern
+from hfss_simulation.resources import TimingHistory, choose_job_resources, estimate_mesh_size, run_tuned_analysis
+from aedt_utils.touchstone import parse_touchstone, touchstone_port_count
+from plotting.plotly_utils import get_s11_data, get_3d_pattern_data
+from plotting.run_history import RunHistory
+from plotting.farfield_interp import interpolation_error
 from ui.sidebar_params import dipole_sidebar_params
+from ui.run_history_view import render_run_history
 
 # --- Sidebar ---
 st.sidebar.title("Simulation Setup")
@@ -36,6 +41,7 @@ st.sidebar.info(f"AEDT Version: {DEFAULT_AEDT_VERSION}")
 use_student = st.sidebar.checkbox("Use Student Version", True) # Keep checkbox for toggle, but display info
 st.sidebar.info(f"Using Student Version: {use_student}")
 non_graphical = st.sidebar.checkbox("Non-graphical Mode", False)
+auto_resources = st.sidebar.checkbox("Auto-tune Solver Resources", True, help="Pick cores/tasks per run from machine load and past run timings.")
 
 # Modifiable parameters
 st.sidebar.subheader("Geometry & Frequency")
@@ -49,6 +55,33 @@ freq_ghz = st.sidebar.number_input("Design Frequency (GHz)", value=DEFAULT_FREQ_
 
 dipole_params = dipole_sidebar_params(freq_ghz)
 
+# Optional measured data (e.g. VNA export) to overlay on the simulated S11
+st.sidebar.subheader("Measured Data")
+measured_file = st.sidebar.file_uploader("Touchstone File (.s1p/.sNp)", help="Measured S-parameters to overlay on the simulated S11 (port 1 reflection is used).")
+measured = None
+if measured_file is not None:
+    try:
+        n_ports = touchstone_port_count(measured_file.name)
+        freqs_meas, s_meas, _ = parse_touchstone(measured_file.getvalue(), n_ports)
+        measured = (freqs_meas, s_meas)
+        st.sidebar.info(f"Loaded {freqs_meas.size} measured points ({n_ports} port(s)).")
+    except ValueError as e:
+        st.sidebar.error(f"Could not read Touchstone file: {e}")
+
+# In-session run history (result arrays only, bounded by run count and memory budget)
+with st.sidebar.popover("Run History Options"):
+    history_max_runs = st.number_input("Max Stored Runs", min_value=1, max_value=100, value=DEFAULT_HISTORY_MAX_RUNS, step=1, help="Older runs are evicted least-recently-viewed first.")
+    history_budget_mb = st.number_input("Memory Budget (MB)", min_value=1, max_value=1024, value=DEFAULT_HISTORY_BUDGET_MB, step=10, help="Upper bound for the stored result arrays.")
+# Far-field resampling: fetch a coarse grid from HFSS and interpolate locally
+with st.sidebar.popover("Far-field Options"):
+    farfield_step = st.selectbox("Fetch Step (deg)", (5, 10, 15, 30, "All"), index=1, help="Theta/Phi step requested from HFSS. 'All' fetches the full far-field setup grid.")
+    farfield_step = None if farfield_step == "All" else farfield_step
+    pattern_step_deg = st.number_input("Display Resolution (deg)", min_value=0.5, max_value=10.0, value=2.0, step=0.5, help="Angular step of the locally interpolated 3D pattern.")
+    validate_farfield = st.checkbox("Validate Against Fine Grid", False, help="Also fetch the full grid once per run and report the interpolation error.")
+if 'run_history' not in st.session_state:
+    st.session_state.run_history = RunHistory()
+run_history = st.session_state.run_history
+run_history.configure(max_runs=history_max_runs, budget_bytes=history_budget_mb * 1024 * 1024)
 
 
 # --- Main App Area ---
@@ -241,26 +274,50 @@ if parameters_loaded:
 
                     # 1. Running Analysis
                     status_placeholders['analysis_run'].info("   Running Analysis...")
-                    run_analysis(hfss, setup_name)
-                    status_placeholders['analysis_run'].success("   Analysis complete.") # Use success briefly
+                    if auto_resources:
+                        if 'timing_history' not in st.session_state:
+                            st.session_state.timing_history = TimingHistory(os.path.join(os.getcwd(), TIMING_HISTORY_FILE))
+                        max_passes = st.session_state.get('analysis_params', {}).get('max_passes', 10)
+                        mesh_size = estimate_mesh_size(params, max_passes)
+                        resources = choose_job_resources(mesh_size, history=st.session_state.timing_history)
+                        # Refuse before solving rather than letting a shared machine swap
+                        if not resources['fits_in_memory']:
+                            raise RuntimeError(f"Estimated solver memory ({resources['memory_gb']} GB) exceeds the available memory. "
+                                               "Free memory or lower Max Passes, or disable auto-tuning to run anyway.")
+                        status_placeholders['analysis_run'].info(
+                            f"   Running Analysis ({resources['cores']} cores, {resources['tasks']} task(s))...")
+                        resources = run_tuned_analysis(hfss, setup_name, mesh_size, history=st.session_state.timing_history,
+                                                       resources=resources)
+                        success = resources['success']
+                        message = f"   Analysis complete ({resources['cores']} cores, {resources['tasks']} task(s), {resources['wall_time_s']:.0f} s)."
+                    else:
+                        success = run_analysis(hfss, setup_name) is not False
+                        message = "   Analysis complete."
+                    if not success:
+                        raise RuntimeError(f"Analysis of setup '{setup_name}' failed.")
+                    status_placeholders['analysis_run'].success(message) # Use success briefly
                     time.sleep(1) # Keep success message briefly
                     status_placeholders['analysis_run'].empty()
 
                     # 2. Generating Plots
                     status_placeholders['plots'].info("   Generating Plots...")
-                    # Interactive S11 plot
-                    fig_s11 = interactive_s11(hfss, setup_name, sweep_name)
-                    if fig_s11:
-                        st.plotly_chart(fig_s11, use_container_width=True)
-                    else:
-                        st.warning("Could not generate S11 plot.")
-
-                    # Interactive 3D radiation pattern
-                    fig_3d = interactive_3d_pattern(hfss, params['freq_ghz'], setup_name)
-                    if fig_3d:
-                        st.plotly_chart(fig_3d, use_container_width=True)
-                    else:
-                        st.warning("Could not generate 3D radiation pattern.")
+                    s11_data = get_s11_data(hfss, setup_name, sweep_name)
+                    pattern_data = get_3d_pattern_data(hfss, params['freq_ghz'], setup_name, angle_step_deg=farfield_step)
+                    # Store compact result arrays so the plots survive reruns
+                    label = f"{st.session_state.design_name} @ {params['freq_ghz']} GHz ({time.strftime('%H:%M:%S')})"
+                    run_id = run_history.add(label, params['freq_ghz'], s11_data=s11_data, pattern_data=pattern_data,
+                                             params=st.session_state.get('analysis_params'))
+                    if validate_farfield and farfield_step and pattern_data:
+                        # Validate the cached model that the results view displays
+                        reference = get_3d_pattern_data(hfss, params['freq_ghz'], setup_name)
+                        try:
+                            run = run_history.peek(run_id)
+                            model = run_history.farfield_model(run)
+                            if reference and model is not None:
+                                run['params']['farfield_error'] = interpolation_error(model, *reference)
+                        except ValueError as e:
+                            st.warning(f"Could not validate far-field interpolation: {e}")
+                    st.session_state.pop('history_run', None) # Reset the selection so the newest run is shown
                     status_placeholders['plots'].empty()
 
                     st.success("Simulation run completed successfully!")
@@ -273,6 +330,10 @@ if parameters_loaded:
                     import traceback
                     st.error(traceback.format_exc()) # Show detailed error in app
 
+# --- Results: rebuilt from the run history on every rerun ---
+if len(run_history):
+    render_run_history(run_history, measured=measured, pattern_step_deg=pattern_step_deg)
+
 # --- Step 4: Cleanup ---
 # Cleanup Button (conditionally displayed)
 if aedt_initialized: # Show if AEDT was ever initialized
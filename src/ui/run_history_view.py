@@ -0,0 +1,68 @@
+import streamlit as st
+from plotting.plotly_utils import s11_figure, pattern_3d_figure, pattern_cut_figure
+from plotting.run_history import s11_from_run, pattern_from_run
+
+
+def render_run(history, run, measured=None, key_prefix="run", pattern_step_deg=2.0):
+    """Rebuild and show the S11, 3D pattern and pattern cut figures of a stored run."""
+    key = f"{key_prefix}_{run['id']}"
+    s11_data = s11_from_run(run)
+    if s11_data:
+        freqs, s11 = s11_data
+        st.plotly_chart(s11_figure(freqs, s11, measured=measured), use_container_width=True, key=f"{key}_s11")
+        st.download_button("Download S11 (.s1p)", history.touchstone_text(run),
+                           file_name=f"run_{run['id']}.s1p", mime="text/plain", key=f"{key}_download")
+    else:
+        st.warning("Could not generate S11 plot.")
+
+    try:
+        model = history.farfield_model(run)
+    except ValueError as e:
+        model = None
+        st.info(f"Showing the far-field grid as fetched (no interpolation: {e})")
+    if model is not None:
+        # Resample the cached far-field model locally at the requested resolution
+        theta, phi, gain = model.grid(pattern_step_deg, pattern_step_deg)
+        st.plotly_chart(pattern_3d_figure(theta, phi, gain, run['freq_ghz']), use_container_width=True, key=f"{key}_3d")
+        farfield_error = run['params'].get('farfield_error')
+        if farfield_error:
+            st.caption(f"Interpolation error vs. fine grid: max {farfield_error['max_abs']:.3g} "
+                       f"({farfield_error['max_rel_peak']:.2%} of peak), RMS {farfield_error['rms']:.3g}")
+        cut_phi = st.number_input("Cut Plane Phi (deg)", min_value=-180.0, max_value=180.0, value=0.0, step=5.0,
+                                  help="Phi = 0 is the E-plane of the z-oriented dipole.", key=f"{key}_cut_phi")
+        angle, values = model.phi_cut(cut_phi)
+        st.plotly_chart(pattern_cut_figure(angle, values, f'Pattern Cut @ Phi = {cut_phi:g} deg', 'Theta (deg)'),
+                        use_container_width=True, key=f"{key}_cut_phi_fig")
+        phi_cut, values = model.theta_cut(90.0)
+        st.plotly_chart(pattern_cut_figure(phi_cut, values, 'H-plane Cut @ Theta = 90 deg', 'Phi (deg)'),
+                        use_container_width=True, key=f"{key}_cut_theta_fig")
+    elif pattern_from_run(run):
+        theta, phi, gain = pattern_from_run(run)
+        st.plotly_chart(pattern_3d_figure(theta, phi, gain, run['freq_ghz']), use_container_width=True, key=f"{key}_3d")
+    else:
+        st.warning("Could not generate 3D radiation pattern.")
+
+
+def render_run_history(history, measured=None, pattern_step_deg=2.0):
+    """Show the latest (or a selected) run, or two runs side by side for comparison."""
+    run_ids = history.run_ids()
+    labels = {run_id: f"#{run_id} {history.peek(run_id)['label']}" for run_id in run_ids}
+    # Drop selections pointing at evicted runs so the selectboxes fall back to their defaults
+    for key in ("history_run", "history_run_a", "history_run_b"):
+        if key in st.session_state and st.session_state[key] not in labels:
+            del st.session_state[key]
+    st.subheader("Results")
+    st.caption(f"{len(run_ids)} run(s) in history, {history.nbytes / 1024:.1f} KB")
+
+    compare = len(run_ids) > 1 and st.checkbox("Compare two runs", value=False)
+    if compare:
+        col_a, col_b = st.columns(2)
+        with col_a:
+            run_a = st.selectbox("Run A", run_ids, index=len(run_ids) - 2, format_func=labels.get, key="history_run_a")
+            render_run(history, history.get(run_a), measured=measured, key_prefix="a", pattern_step_deg=pattern_step_deg)
+        with col_b:
+            run_b = st.selectbox("Run B", run_ids, index=len(run_ids) - 1, format_func=labels.get, key="history_run_b")
+            render_run(history, history.get(run_b), measured=measured, key_prefix="b", pattern_step_deg=pattern_step_deg)
+    else:
+        selected = st.selectbox("Run", run_ids, index=len(run_ids) - 1, format_func=labels.get, key="history_run")
+        render_run(history, history.get(selected), measured=measured, pattern_step_deg=pattern_step_deg)
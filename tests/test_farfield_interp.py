@@ -0,0 +1,79 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from plotting.farfield_interp import FarFieldModel, coarse_angles, interpolation_error
+
+
+def _dipole_pattern(theta_deg, phi_deg):
+    """Band-limited, slightly asymmetric dipole-like gain on the theta x phi grid."""
+    theta, phi = np.meshgrid(np.radians(theta_deg), np.radians(phi_deg), indexing="ij")
+    return (1.64 * np.sin(theta) ** 2 * (1 + 0.3 * np.sin(theta) * np.cos(phi))
+            + 0.2 * np.cos(theta) ** 2 + 0.1 * np.sin(theta) ** 2 * np.cos(2 * phi))
+
+
+def test_reproduces_samples_exactly():
+    theta, phi = coarse_angles(15)
+    rng = np.random.default_rng(0)
+    values = rng.uniform(0.0, 2.0, (theta.size, phi.size))
+    # Samples on the sphere must agree at the poles and at phi = -180 / 180
+    values[0, :] = values[0, 0]
+    values[-1, :] = values[-1, 0]
+    values[:, -1] = values[:, 0]
+    model = FarFieldModel.from_grid(theta, phi, values)
+    np.testing.assert_allclose(model.evaluate(theta, phi), values, atol=1e-12)
+
+
+def test_fine_grid_recovered_from_coarse_fetch():
+    theta, phi = coarse_angles(10)
+    model = FarFieldModel.from_grid(theta, phi, _dipole_pattern(theta, phi))
+    theta_fine, phi_fine = coarse_angles(1)
+    error = interpolation_error(model, theta_fine, phi_fine, _dipole_pattern(theta_fine, phi_fine))
+    assert error["max_abs"] < 1e-12
+    assert error["rms"] <= error["max_abs"]
+    assert error["max_rel_peak"] < 1e-12
+
+
+def test_interpolation_error_reports_undersampling():
+    theta, phi = coarse_angles(30)
+    sharp = lambda t, p: _dipole_pattern(t, p) ** 8
+    model = FarFieldModel.from_grid(theta, phi, sharp(theta, phi))
+    theta_fine, phi_fine = coarse_angles(1)
+    error = interpolation_error(model, theta_fine, phi_fine, sharp(theta_fine, phi_fine))
+    assert error["max_rel_peak"] > 1e-3
+
+
+def test_phi_range_conventions_give_the_same_model():
+    theta = np.arange(0, 181, 10)
+    phi_signed = np.arange(-180, 181, 10)
+    phi_positive = np.arange(0, 361, 10)
+    signed = FarFieldModel.from_grid(theta, phi_signed, _dipole_pattern(theta, phi_signed))
+    positive = FarFieldModel.from_grid(theta, phi_positive, _dipole_pattern(theta, phi_positive))
+    theta_eval, phi_eval = np.arange(0, 181, 7), np.arange(-180, 181, 7)
+    np.testing.assert_allclose(signed.evaluate(theta_eval, phi_eval), positive.evaluate(theta_eval, phi_eval), atol=1e-12)
+
+
+def test_phi_cut_maps_negative_angles_to_opposite_half_plane():
+    theta, phi = coarse_angles(10)
+    model = FarFieldModel.from_grid(theta, phi, _dipole_pattern(theta, phi))
+    angle, values = model.phi_cut(30.0, n_points=361)
+    for a, v in zip(angle, values):
+        expected = _dipole_pattern([abs(a)], [30.0 if a >= 0 else 210.0])[0, 0]
+        assert v == pytest.approx(expected, abs=1e-12)
+    # The cut passes through the poles continuously
+    assert values[180] == pytest.approx(_dipole_pattern([0.0], [0.0])[0, 0], abs=1e-12)
+
+
+def test_invalid_grids_raise():
+    theta, phi = coarse_angles(10)
+    values = _dipole_pattern(theta, phi)
+    with pytest.raises(ValueError):
+        FarFieldModel.from_grid(theta[1:], phi, values[1:])  # Missing pole
+    with pytest.raises(ValueError):
+        FarFieldModel.from_grid(theta, phi[:-5], values[:, :-5])  # Partial phi turn
+    with pytest.raises(ValueError):
+        coarse_angles(7)
@@ -0,0 +1,109 @@
+import json
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from hfss_simulation.resources import (SimulatedBackend, TimingHistory, choose_job_resources, plan_batch,
+                                      run_tuned_analysis)
+
+TRUE_MODEL = {"seconds_per_unit": 1e-4, "size_exponent": 1.3, "serial_fraction": 0.05}
+
+
+def _load(busy_cores, total_cores=16, available_memory_gb=64.0):
+    return {"total_cores": total_cores, "busy_cores": busy_cores, "available_memory_gb": available_memory_gb}
+
+
+def test_tuned_runs_converge_to_simulated_scaling(tmp_path):
+    history = TimingHistory(str(tmp_path / "timings.json"))
+    seed = 0
+    for mesh_size in (2e4, 5e4, 1e5, 2e5):
+        for busy_cores in (0, 8, 12, 14):
+            backend = SimulatedBackend(mesh_size, noise=0.02, seed=seed, **TRUE_MODEL)
+            seed += 1
+            resources = run_tuned_analysis(backend, "Setup", mesh_size, history=history,
+                                           load=_load(busy_cores), clock=backend.clock)
+            assert resources["success"]
+            assert backend.calls[-1]["cores"] == resources["cores"] <= 16 - busy_cores
+
+    model = history.fit()
+    assert abs(model["serial_fraction"] - TRUE_MODEL["serial_fraction"]) <= 0.02
+    assert abs(model["size_exponent"] - TRUE_MODEL["size_exponent"]) <= 0.05
+    # The history is persisted and reloads to the same fit
+    assert TimingHistory(str(tmp_path / "timings.json")).fit() == model
+
+
+def test_failed_and_zero_time_runs_are_not_recorded(tmp_path):
+    file_path = tmp_path / "timings.json"
+    history = TimingHistory(str(file_path))
+    backend = SimulatedBackend(1e5, fail=True, **TRUE_MODEL)
+    resources = run_tuned_analysis(backend, "Setup", 1e5, history=history, load=_load(0), clock=backend.clock)
+    assert not resources["success"]
+    history.record(1e4, 4, 0.0)
+    assert history.records == []
+
+    # Invalid records already in the file are dropped on load and the fit stays finite
+    file_path.write_text(json.dumps([
+        {"mesh_size": 1e4, "cores": 4, "tasks": 1, "wall_time_s": 0.0},
+        {"mesh_size": 2e4, "cores": 2, "tasks": 1, "wall_time_s": 30.0},
+        {"mesh_size": 4e4, "cores": 8, "tasks": 1, "wall_time_s": 25.0},
+    ]))
+    model = TimingHistory(str(file_path)).fit()
+    assert all(math.isfinite(v) for v in model.values())
+
+
+def test_plan_batch_concurrency():
+    history = TimingHistory()
+    for cores in (1, 2, 4, 8, 16):
+        for mesh_size in (2e4, 1e5):
+            backend = SimulatedBackend(mesh_size, **TRUE_MODEL)
+            backend.analyze_setup("Setup", cores=cores)
+            history.record(mesh_size, cores, backend.clock())
+
+    # Many equal small jobs: running several at once beats one job with all cores
+    plan = plan_batch([2e4] * 8, history=history, load=_load(0))
+    assert plan["concurrency"] > 1
+    assert plan["concurrency"] * plan["cores"] <= 16
+
+    # A single job gets the whole machine
+    plan = plan_batch([1e5], history=history, load=_load(0))
+    assert plan["concurrency"] == 1 and plan["cores"] == 16
+
+    # Concurrency is capped by available memory
+    plan = plan_batch([2e4] * 8, history=history, load=_load(0, available_memory_gb=3.0))
+    assert plan["concurrency"] * plan["memory_gb"] <= 3.0
+
+
+def test_core_count_depends_on_mesh_size():
+    history = TimingHistory()
+    for mesh_size in (2e4, 5e4, 1e5, 2e5):
+        for cores in (1, 4, 16):
+            backend = SimulatedBackend(mesh_size, **TRUE_MODEL)
+            backend.analyze_setup("Setup", cores=cores)
+            history.record(mesh_size, cores, backend.clock())
+
+    small = choose_job_resources(5e3, history=history, load=_load(0))
+    large = choose_job_resources(3e5, history=history, load=_load(0))
+    assert 1 <= small["cores"] < large["cores"] <= 16
+
+
+def test_job_exceeding_memory_is_not_solved():
+    history = TimingHistory()
+    backend = SimulatedBackend(1e6, **TRUE_MODEL)
+    resources = choose_job_resources(1e6, history=history, load=_load(0, available_memory_gb=2.0))
+    assert not resources["fits_in_memory"]
+    assert resources["memory_gb"] > 2.0  # The real estimate, not the available memory
+
+    result = run_tuned_analysis(backend, "Setup", 1e6, history=history, resources=resources, clock=backend.clock)
+    assert result["skipped"] and not result["success"]
+    assert backend.calls == [] and history.records == []
+
+
+def test_sessions_sharing_a_file_keep_each_others_timings(tmp_path):
+    file_path = str(tmp_path / "timings.json")
+    session_a, session_b = TimingHistory(file_path), TimingHistory(file_path)
+    session_a.record(1e4, 2, 10.0)
+    session_b.record(2e4, 4, 20.0)
+    session_a.record(3e4, 8, 30.0)
+    assert [r["mesh_size"] for r in TimingHistory(file_path).records] == [1e4, 2e4, 3e4]
@@ -0,0 +1,93 @@
+import io
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from aedt_utils.touchstone import parse_touchstone, read_touchstone, resample_s_parameters, write_touchstone
+
+
+def _random_s(n_freqs, n_ports, seed=0):
+    rng = np.random.default_rng(seed)
+    mag = rng.uniform(0.01, 1.0, (n_freqs, n_ports, n_ports))
+    phase = rng.uniform(-np.pi, np.pi, (n_freqs, n_ports, n_ports))
+    return mag * np.exp(1j * phase)
+
+
+@pytest.mark.parametrize("n_ports", [1, 2, 3, 5])
+@pytest.mark.parametrize("data_format", ["RI", "MA", "DB"])
+@pytest.mark.parametrize("unit", ["Hz", "kHz", "MHz", "GHz"])
+def test_write_parse_round_trip(n_ports, data_format, unit):
+    freqs = np.linspace(1e9, 2e9, 21)
+    s = _random_s(freqs.size, n_ports)
+    buffer = io.StringIO()
+    write_touchstone(buffer, freqs, s, unit=unit, data_format=data_format, comment="round trip\nsecond line")
+    data = buffer.getvalue().encode("ascii")
+
+    for chunk_size in (1, 64, len(data)):
+        freqs_parsed, s_parsed, z0 = parse_touchstone(data, n_ports, chunk_size=chunk_size)
+        assert z0 == 50.0
+        np.testing.assert_allclose(freqs_parsed, freqs, rtol=1e-9)
+        np.testing.assert_allclose(s_parsed, s, atol=1e-7)
+
+
+def test_two_port_column_order():
+    data = b"# MHz S RI R 50\n100 11 0 21 0 12 0 22 0\n"
+    _, s, _ = parse_touchstone(data, 2)
+    np.testing.assert_array_equal(s[0].real, [[11, 12], [21, 22]])
+
+
+def test_two_port_noise_block_and_comments_are_ignored():
+    data = (b"! Measured with a VNA\n"
+            b"# GHz S MA R 75\n"
+            b"1.0 0.5 90 0.1 0 0.1 0 0.5 -90 ! first point\n"
+            b"! a comment on its own line\n"
+            b"2.0 0.25 0 0.1 0 0.1 0 0.25 0\n"
+            b"! noise parameters\n"
+            b"1.0 1.2 0.3 45 0.4\n"
+            b"2.0 1.5 0.2 30 0.3\n")
+    for chunk_size in (1, 16, len(data)):
+        freqs, s, z0 = parse_touchstone(data, 2, chunk_size=chunk_size)
+        assert z0 == 75.0
+        np.testing.assert_allclose(freqs, [1e9, 2e9])
+        np.testing.assert_allclose(s[:, 0, 0], [0.5j, 0.25], atol=1e-12)
+        np.testing.assert_allclose(s[:, 1, 1], [-0.5j, 0.25], atol=1e-12)
+
+
+def test_whitespace_only_chunks_add_no_values():
+    # np.fromstring parses whitespace-only text as [-1.]; blank lines must not add data
+    data = b"# GHz S RI R 50\n\n   \n1 0.5 0.5\n\n\n2 0.25 0.25\n  \n"
+    freqs, s, _ = parse_touchstone(data, 1, chunk_size=1)
+    np.testing.assert_allclose(freqs, [1e9, 2e9])
+    np.testing.assert_allclose(s[:, 0, 0], [0.5 + 0.5j, 0.25 + 0.25j])
+
+
+def test_read_file_with_and_without_mmap(tmp_path):
+    freqs = np.linspace(0.5e9, 1.5e9, 101)
+    s = _random_s(freqs.size, 4, seed=1)
+    file_path = tmp_path / "measured.s4p"
+    write_touchstone(str(file_path), freqs, s)
+    for use_mmap in (True, False):
+        freqs_read, s_read, _ = read_touchstone(str(file_path), use_mmap=use_mmap)
+        np.testing.assert_allclose(freqs_read, freqs)
+        np.testing.assert_allclose(s_read, s, atol=1e-8)
+
+
+def test_invalid_content_raises():
+    with pytest.raises(ValueError):
+        parse_touchstone(b"1 0.5 0\n", 1)
+    with pytest.raises(ValueError):
+        parse_touchstone(b"# GHz S MA R 50\n[Version] 2.0\n", 1)
+    with pytest.raises(ValueError):
+        parse_touchstone(b"# GHz S MA R 50\n1 0.5 0 0.1\n", 1)
+
+
+def test_resample_is_nan_outside_source_band():
+    freqs = np.array([1e9, 2e9])
+    s = np.array([0.0 + 0.0j, 1.0 + 1.0j])
+    resampled = resample_s_parameters(freqs, s, [0.5e9, 1.5e9, 2.5e9])
+    assert np.isnan(resampled[0]) and np.isnan(resampled[2])
+    assert resampled[1] == pytest.approx(0.5 + 0.5j)